@@ -1,16 +1,233 @@
-import re
-from dataclasses import dataclass
-from typing import Self
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, NamedTuple, Self
 
 import fitz
+import numpy as np
 
-HYPERLINK_PATTERN = re.compile(r"^(http|https)://")
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
+HYPERLINK_PREFIXES = ("http://", "https://")
 
-@dataclass
-class Span:
+
+def _concat_texts(texts: Iterable[str]) -> str:
+    """Concatenate span texts without a separator.
+
+    URLs are almost always plain ASCII, so the common case accumulates the
+    encoded bytes in a single growable buffer and decodes once, instead of
+    building an intermediate sequence of small strings. Falls back to a
+    plain join as soon as a non-ASCII text shows up.
+
+    Args:
+        texts (Iterable[str]): The span texts to concatenate.
+
+    Returns:
+        str: The concatenated text.
+    """
+
+    buffer = bytearray()
+    for text in texts:
+        if not text.isascii():
+            return "".join(texts)
+        buffer += text.encode("ascii")
+    return buffer.decode("ascii")
+
+
+def _walk_page(
+    page: dict,
+    font_sizes: list,
+    font_family_ids: list,
+    family_ids: dict,
+    text_colors: list,
+    texts: list,
+) -> None:
+    """Append the span columns of one page dictionary to the given lists.
+
+    Args:
+        page (dict): A page dictionary obtained from `get_text('dict')`.
+        font_sizes (list): The font size column to append to.
+        font_family_ids (list): The font family id column to append to.
+        family_ids (dict): The font family name to id interning table.
+        text_colors (list): The text color column to append to.
+        texts (list): The span text column to append to.
+    """
+
+    # Bind the bound methods used on every span to local names once; this
+    # skips the attribute lookup per iteration in the hot loop.
+    append_font_size = font_sizes.append
+    append_font_family_id = font_family_ids.append
+    append_text_color = text_colors.append
+    append_text = texts.append
+    get_family_id = family_ids.setdefault
+    intern = sys.intern
+    for block in page["blocks"]:
+        for line in block.get("lines", ()):
+            for span in line["spans"]:
+                append_font_size(span["size"])
+                # The same few font family names repeat across all pages;
+                # interning deduplicates the strings before they are
+                # mapped to their per-document id.
+                family = intern(span["font"])
+                append_font_family_id(get_family_id(family, len(family_ids)))
+                append_text_color(span["color"])
+                append_text(span["text"])
+
+
+try:
+    # Use the Cython-compiled page walk when the optional extension was
+    # built; it does the same work without per-iteration interpreter
+    # dispatch.
+    from ._extract import walk_page as _walk_page  # noqa: F811
+except ImportError:
+    pass
+
+
+def _extract_spans(
+    pages: Iterable[dict],
+) -> tuple[np.ndarray, np.ndarray, tuple[str, ...], np.ndarray, np.ndarray]:
+    """Extract the span metadata and text arrays from page dictionaries.
+
+    The pages are consumed one at a time, so a lazy iterable keeps at most
+    one page dictionary alive instead of the whole document's worth.
+
+    Font families are mapped to small integer ids via a per-document
+    interning table, so the metadata comparisons downstream are pure
+    integer compares; the id-to-name table is returned alongside the
+    arrays to reconstruct the names.
+
+    Args:
+        pages (Iterable[dict]): An iterable of page dictionaries obtained
+            from `get_text('dict')`.
+
+    Returns:
+        tuple: The `font_size`, `font_family_id`, `families`, `text_color`
+            and `text` columns, one array entry per span.
+    """
+
+    family_ids: dict[str, int] = {}
+    font_sizes: list[float] = []
+    font_family_ids: list[int] = []
+    text_colors: list[int] = []
+    texts: list[str] = []
+    # Extract texts from a list of dicts constructed with get_text('dict').
+    # Each page has blocks, each blocks has lines, each lines has spans.
+    # For further analyses we are only interested and can rely on the span
+    # information.
+    #
+    # Some text blongs to each other, even if it is in other blocks.
+    # The dicts stores somoe metadata, such as font and text color
+    # information.
+    for page in pages:
+        _walk_page(page, font_sizes, font_family_ids, family_ids, text_colors, texts)
+
+    return (
+        np.array(font_sizes, dtype=np.float32),
+        np.array(font_family_ids, dtype=np.int32),
+        tuple(family_ids),
+        np.array(text_colors, dtype=np.int32),
+        np.array(texts, dtype=object),
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_span_arrays(
+    path: str, mtime_ns: int, size: int
+) -> tuple[np.ndarray, np.ndarray, tuple[str, ...], np.ndarray, np.ndarray]:
+    """Parse a PDF document and return its span arrays.
+
+    The result is cached on `(path, mtime_ns, size)` so that analyzing the
+    same unchanged document again skips the parse entirely.
+
+    Args:
+        path (str): The path to the PDF document.
+        mtime_ns (int): The modification time of the file in nanoseconds.
+        size (int): The size of the file in bytes.
+
+    Returns:
+        tuple: The span arrays as returned by `_extract_spans`.
+    """
+
+    # Only span text and metadata are needed; leaving image blocks out
+    # of the page dictionaries avoids allocating structures (and the
+    # raw image data) that extraction would throw away anyway.
+    flags = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+    with fitz.open(path) as doc:
+        page_count = doc.page_count
+
+    # get_text releases the GIL, so pages can be parsed in parallel. A
+    # document handle is not safe to share across threads, though, so each
+    # worker thread opens its own handle on first use.
+    local = threading.local()
+    documents: list[fitz.Document] = []
+
+    def get_page(number: int) -> dict:
+        doc = getattr(local, "doc", None)
+        if doc is None:
+            doc = local.doc = fitz.open(path)
+            documents.append(doc)
+        return doc.load_page(number).get_text("dict", flags=flags)
+
+    max_workers = min(page_count, os.cpu_count() or 1) or 1
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map preserves page order and yields lazily, so extraction
+            # streams the page dictionaries as the workers produce them
+            # instead of materializing all of them at once.
+            return _extract_spans(executor.map(get_page, range(page_count)))
+    finally:
+        for doc in documents:
+            doc.close()
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _find_breaks(
+        font_size: np.ndarray, font_family_id: np.ndarray, text_color: np.ndarray
+    ) -> np.ndarray:
+        """Find the span indices at which a new fragment starts.
+
+        A compiled single pass over the metadata arrays; fuses the three
+        comparisons per span instead of three separate array passes.
+
+        Args:
+            font_size (np.ndarray): The font size per span.
+            font_family_id (np.ndarray): An integer id per span font family.
+            text_color (np.ndarray): The text color per span.
+
+        Returns:
+            np.ndarray: The indices where the metadata differs from the
+                previous span.
+        """
+
+        breaks = np.empty(font_size.shape[0], dtype=np.int64)
+        count = 0
+        for i in range(1, font_size.shape[0]):
+            if (
+                font_size[i] != font_size[i - 1]
+                or font_family_id[i] != font_family_id[i - 1]
+                or text_color[i] != text_color[i - 1]
+            ):
+                breaks[count] = i
+                count += 1
+        return breaks[:count]
+
+
+class Span(NamedTuple):
     """Represents a span of text in a PDF document.
 
+    Spans are stored internally as parallel arrays on the analyzer; a
+    `Span` is only a lightweight view that is materialized on demand.
+
     Attributes:
         font_size (float): The font size of the span.
         font_family (str): The font family of the span.
@@ -41,27 +258,71 @@ class Span:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Fragment:
     """Represents a fragment of text in a PDF document.
 
     Attributes:
         index (int): The index of the fragment.
-        spans (list[Span]): List of spans belonging to the fragment.
+        start (int): The index of the fragment's first span in the
+            analyzer's span arrays.
+        end (int): The index one past the fragment's last span.
         font_size (float): The font size of the fragment.
         font_family (str): The font family of the fragment.
         text_color (int): The color of the text in the fragment.
+        texts (np.ndarray): View into the analyzer's span text array with
+            the text of each span of the fragment.
         text (str): The combined text content of the spans (optional).
     """
 
     index: int
-    spans: list[Span]
+    start: int
+    end: int
     font_size: float
     font_family: str
     text_color: int
+    # Excluded from comparison: the generated __eq__ would otherwise try to
+    # truth-test the element-wise array comparison and raise; the scalar
+    # fields and the span range identify the fragment already.
+    texts: np.ndarray = field(compare=False)
     # The text attribute is set if the spans belong together, e.g. a
     # hyper link.
     text: str = None
+    # Cache for the rendered property; not part of the fragment's value,
+    # so it must not influence comparison.
+    _rendered: str = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def rendered(self) -> str:
+        """The displayed text of the fragment, computed once.
+
+        Either the explicitly set `text` or the joined span texts; the
+        result is cached so repeated paragraph scans over the same
+        fragment do not re-join its spans.
+
+        Returns:
+            str: The rendered text of the fragment.
+        """
+
+        if self._rendered is None:
+            self._rendered = self.text or self.to_string()
+        return self._rendered
+
+    @property
+    def spans(self) -> list[Span]:
+        """Materialize the span views belonging to the fragment.
+
+        All spans of a fragment share its metadata by construction, so the
+        views are built from the fragment's own attributes and text view.
+
+        Returns:
+            list[Span]: List of spans belonging to the fragment.
+        """
+
+        return [
+            Span(self.font_size, self.font_family, self.text_color, text)
+            for text in self.texts
+        ]
 
     def to_string(self, join_str: str = " ") -> str:
         """Convert the fragment to a string by joining the text of its spans.
@@ -74,7 +335,7 @@ class Fragment:
             str: The combined text content of the spans.
         """
 
-        return join_str.join([span.text for span in self.spans])
+        return join_str.join(self.texts)
 
 
 class PDFAnalyzer:
@@ -89,11 +350,22 @@ class PDFAnalyzer:
             path (str): The path to the PDF document.
         """
 
-        with fitz.open(path) as doc:
-            pages = [page.get_text("dict") for page in doc]
-
-        spans = self.extract_spans(pages)
-        self._fragments = self.convert_to_fragments(spans)
+        stat = os.stat(path)
+        (
+            self._font_size,
+            self._font_family_id,
+            self._families,
+            self._text_color,
+            self._text,
+        ) = _load_span_arrays(str(path), stat.st_mtime_ns, stat.st_size)
+        # An immutable tuple; read-only internal loops iterate it with
+        # islice instead of materializing list slices.
+        self._fragments = tuple(self.convert_to_fragments())
+        self._fragment_font_size = np.array(
+            [fragment.font_size for fragment in self._fragments], dtype=np.float32
+        )
+        self._text_index: dict[str, tuple[int, int]] = None
+        self._joined_hyperlinks: set[tuple[int, int]] = set()
 
     def get_fragments(self, start=0, end=None) -> list[Fragment]:
         """Get a list of fragments from the analyzed PDF document.
@@ -106,7 +378,7 @@ class PDFAnalyzer:
             list[Fragment]: A list of fragments.
         """
 
-        return self._fragments[start:end]
+        return list(self._fragments[start:end])
 
     def get_fragment(self, index: int) -> Fragment:
         """Get a fragment from the analyzed PDF document by its index.
@@ -120,86 +392,86 @@ class PDFAnalyzer:
 
         return self._fragments[index]
 
-    def extract_spans(self, pages: list[dict]) -> list[Span]:
-        """
-        Extract spans of text from the pages of the PDF document.
+    def get_span(self, index: int) -> Span:
+        """Materialize a span view from the internal span arrays.
 
         Args:
-            pages (list[dict]): A list of page dictionaries obtained from `get_text('dict')`.
+            index (int): The index of the span.
 
         Returns:
-            list[Span]: A list of spans.
+            Span: A lightweight view of the span at the given index.
         """
 
-        spans: list[Span] = []
-        # Extract texts from a list of dicts constructed with get_text('dict').
-        # Each page has blocks, each blocks has lines, each lines has spans.
-        # For further analyses we are only interested and can rely on the span
-        # information.
-        #
-        # Some text blongs to each other, even if it is in other blocks.
-        # The dicts stores somoe metadata, such as font and text color
-        # information.
-        for page in pages:
-            for block in page["blocks"]:
-                if "lines" not in block:
-                    continue
-
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        spans.append(
-                            Span(
-                                span["size"], span["font"], span["color"], span["text"]
-                            )
-                        )
-
-        return spans
-
-    def convert_to_fragments(self, spans: list[Span]) -> list[Fragment]:
-        """Convert a list of spans to fragments based on their metadata.
+        return Span(
+            float(self._font_size[index]),
+            self._families[self._font_family_id[index]],
+            int(self._text_color[index]),
+            self._text[index],
+        )
+
+    def extract_spans(self, pages: list[dict]) -> None:
+        """
+        Extract spans of text from the pages of the PDF document.
+
+        The spans are stored as parallel arrays (`_font_size`,
+        `_font_family_id`, `_text_color`, `_text`) on the analyzer instead
+        of one Python object per span, which keeps the memory footprint low
+        on large documents and allows the metadata comparisons downstream
+        to operate on whole arrays.
 
         Args:
-            spans (list[Span]): A list of spans.
+            pages (list[dict]): A list of page dictionaries obtained from `get_text('dict')`.
+        """
+
+        (
+            self._font_size,
+            self._font_family_id,
+            self._families,
+            self._text_color,
+            self._text,
+        ) = _extract_spans(pages)
+
+    def convert_to_fragments(self) -> list[Fragment]:
+        """Convert the extracted span arrays to fragments based on their
+        metadata.
 
         Returns:
             list[Fragment]: A list of fragments.
         """
 
-        fragments: list[Fragment] = []
-
-        previous: Span = spans[0]
-        fragment: list[Span] = [previous]
-        index = 0
-        for current in spans[1:]:
-            # If the metadata (all attributes but text) differs, assume that
-            # this data doesn't belong to each other. Start a new fragemnt and
-            # add the old data to the list of fragments.
-            if not current.has_equal_metadata(previous):
-                fragments.append(
-                    Fragment(
-                        index,
-                        fragment.copy(),
-                        previous.font_size,
-                        previous.font_family,
-                        previous.text_color,
-                    )
-                )
-                index += 1
-                fragment.clear()
-
-            fragment.append(current)
-            previous = current
-
-        fragments.append(
+        font_size = self._font_size
+        font_family_id = self._font_family_id
+        text_color = self._text_color
+        families = self._families
+
+        # If the metadata (all attributes but text) differs from the previous
+        # span, assume that this data doesn't belong to each other and start
+        # a new fragment there. Computing all boundaries at once on the span
+        # arrays replaces the per-span Python loop with a few C-level passes.
+        if njit is not None:
+            break_positions = _find_breaks(font_size, font_family_id, text_color)
+        else:
+            breaks = (
+                (font_size[1:] != font_size[:-1])
+                | (font_family_id[1:] != font_family_id[:-1])
+                | (text_color[1:] != text_color[:-1])
+            )
+            break_positions = np.flatnonzero(breaks) + 1
+        starts = np.concatenate(([0], break_positions))
+        ends = np.concatenate((starts[1:], [len(font_size)]))
+
+        return [
             Fragment(
                 index,
-                fragment.copy(),
-                previous.font_size,
-                previous.font_family,
-                previous.text_color,
+                int(start),
+                int(end),
+                float(font_size[start]),
+                families[font_family_id[start]],
+                int(text_color[start]),
+                self._text[start:end],
             )
-        )
-        return fragments
+            for index, (start, end) in enumerate(zip(starts, ends))
+        ]
 
     def join_hyperlinks(self, start=0, end=None) -> None:
         """Join consecutive spans representing hyperlinks into a single fragment.
@@ -209,13 +481,22 @@ class PDFAnalyzer:
             end (int): The ending index of the fragments to join. Default is None.
         """
 
-        for fragment in self._fragments[start:end]:
+        # Joining is idempotent, so ranges that were already processed can
+        # be skipped instead of re-scanning their fragments.
+        if (start, end) in self._joined_hyperlinks:
+            return
+
+        for fragment in islice(self._fragments, start, end):
             # 1544191 = blue
-            if fragment.text_color == 1544191 and HYPERLINK_PATTERN.match(
-                fragment.spans[0].text
+            if fragment.text_color == 1544191 and fragment.texts[0].startswith(
+                HYPERLINK_PREFIXES
             ):
-                text = fragment.to_string(join_str="")
+                text = _concat_texts(fragment.texts)
                 fragment.text = text
+                # The joined text replaces whatever was rendered before.
+                fragment._rendered = text
+
+        self._joined_hyperlinks.add((start, end))
 
     def get_paragraph(self, start=0, end=None) -> tuple[str, int]:
         """Get a paragraph of text from the analyzed PDF document.
@@ -229,19 +510,23 @@ class PDFAnalyzer:
                 the index of the break.
         """
 
-        previous: Fragment = self._fragments[start]
-        paragraph: list[str] = [previous.text or previous.to_string()]
-        break_index = previous.index
-        for current in self._fragments[start + 1 : end]:
-            if current.font_size != previous.font_size:
-                break_index = current.index
-                break
-            else:
-                text = current.text or current.to_string()
-                paragraph.append(text)
-            previous = current
-
-        return "".join(paragraph), break_index
+        # A paragraph ends at the first fragment whose font size differs
+        # from the starting fragment; find it with a single vectorized scan
+        # over the per-fragment font sizes instead of a Python loop.
+        font_size = self._fragment_font_size
+        breaks = font_size[start + 1 : end] != font_size[start]
+        if breaks.any():
+            length = int(np.argmax(breaks)) + 1
+            break_index = self._fragments[start + length].index
+        else:
+            length = len(breaks) + 1
+            break_index = self._fragments[start].index
+
+        paragraph = "".join(
+            fragment.rendered
+            for fragment in islice(self._fragments, start, start + length)
+        )
+        return paragraph, break_index
 
     def get_index_by_text(self, text: str, start=0, end=None) -> tuple[int, int]:
         """Get the index of a fragment and the index of its span by its text.
@@ -256,9 +541,22 @@ class PDFAnalyzer:
                 span.
         """
 
-        for fragment in self._fragments[start:end]:
-            for i, span in enumerate(fragment.spans):
-                if span.text == text:
+        if start == 0 and end is None:
+            # The default range is queried repeatedly during analysis; build
+            # a span text index once and answer those lookups in O(1).
+            if self._text_index is None:
+                index: dict[str, tuple[int, int]] = {}
+                for fragment in self._fragments:
+                    for i, span_text in enumerate(fragment.texts):
+                        # Keep the first occurrence, like the linear scan.
+                        index.setdefault(span_text, (fragment.index, i))
+                self._text_index = index
+
+            return self._text_index.get(text, (-1, -1))
+
+        for fragment in islice(self._fragments, start, end):
+            for i, span_text in enumerate(fragment.texts):
+                if span_text == text:
                     return fragment.index, i
 
         return -1, -1
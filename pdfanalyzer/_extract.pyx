@@ -0,0 +1,48 @@
+# cython: language_level=3
+"""Cython-compiled page walk for span extraction.
+
+Compiled counterpart of ``pdfanalyzer._walk_page``; the typed dict
+accesses avoid the per-iteration interpreter dispatch of the pure
+Python page walk. Built optionally via ``setup.py build_ext``.
+"""
+
+import sys
+
+
+cpdef walk_page(
+    dict page,
+    list font_sizes,
+    list font_family_ids,
+    dict family_ids,
+    list text_colors,
+    list texts,
+):
+    """Append the span columns of one page dictionary to the given lists.
+
+    Args:
+        page (dict): A page dictionary obtained from `get_text('dict')`.
+        font_sizes (list): The font size column to append to.
+        font_family_ids (list): The font family id column to append to.
+        family_ids (dict): The font family name to id interning table.
+        text_colors (list): The text color column to append to.
+        texts (list): The span text column to append to.
+    """
+
+    cdef dict block, line, span
+    intern = sys.intern
+    for block in page["blocks"]:
+        lines = block.get("lines")
+        if lines is None:
+            continue
+        for line in lines:
+            for span in line["spans"]:
+                font_sizes.append(span["size"])
+                # The same few font family names repeat across all pages;
+                # interning deduplicates the strings before they are
+                # mapped to their per-document id.
+                family = intern(span["font"])
+                font_family_ids.append(
+                    family_ids.setdefault(family, len(family_ids))
+                )
+                text_colors.append(span["color"])
+                texts.append(span["text"])
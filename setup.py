@@ -0,0 +1,12 @@
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    # The compiled page walk is optional; without Cython the pure Python
+    # implementation in pdfanalyzer/__init__.py is used.
+    ext_modules = []
+else:
+    ext_modules = cythonize(["pdfanalyzer/_extract.pyx"])
+
+setup(ext_modules=ext_modules)